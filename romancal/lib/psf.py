@@ -310,7 +310,7 @@ def fit_psf_to_image_model(
     )
 
     if x_init is not None and y_init is not None:
-        guesses = Table(np.column_stack([x_init, y_init]), names=["x_init", "y_init"])
+        guesses = Table([x_init, y_init], names=["x_init", "y_init"])
     else:
         guesses = None
 
@@ -4,24 +4,23 @@ Module to calculate the source catalog.
 
 import logging
 import warnings
+from functools import lru_cache
 from pathlib import Path
 from typing import List
 
 import astropy.units as u
 import numpy as np
-from astropy.convolution import Gaussian2DKernel
 from astropy.coordinates import SkyCoord
-from astropy.nddata.utils import NoOverlapError, extract_array
 from astropy.stats import SigmaClip, gaussian_fwhm_to_sigma
-from astropy.table import QTable, Table
+from astropy.table import Table
 from astropy.utils import lazyproperty
 from astropy.utils.exceptions import AstropyUserWarning
-from photutils.aperture import CircularAnnulus, CircularAperture, aperture_photometry
+from photutils.aperture import CircularAnnulus, CircularAperture
 from photutils.segmentation import SourceCatalog
 from roman_datamodels.datamodels import ImageModel, MosaicModel
 from roman_datamodels.dqflags import pixel
-from scipy import ndimage
-from scipy.spatial import KDTree
+from scipy import ndimage, signal
+from scipy.spatial import cKDTree
 
 from romancal import __version__ as romancal_version
 from romancal.lib import psf
@@ -32,6 +31,315 @@ log = logging.getLogger(__name__)
 log.setLevel(logging.DEBUG)
 
 
+# the static column descriptions of the output catalog, built once at
+# import time and copied by the catalog column name properties
+_SEGMENT_DESCRIPTIONS = {
+    "label": "Unique source identification label number",
+    "xcentroid": "X pixel value of the source centroid (0 indexed)",
+    "ycentroid": "Y pixel value of the source centroid (0 indexed)",
+    "sky_centroid": " Sky coordinate (ICRS) of the source centroid",
+    "isophotal_flux": "Isophotal flux",
+    "isophotal_flux_err": "Isophotal flux error",
+    # isophotal_flux and isophotal_flux_err must be listed before isophotal_abmag
+    # TEMP: do not include ABmags
+    # "isophotal_abmag": "Isophotal AB magnitude",
+    # "isophotal_abmag_err": "Isophotal AB magnitude error",
+    "isophotal_area": "Isophotal area",
+    "semimajor_sigma": (
+        "1-sigma standard deviation along the semimajor axis of the 2D Gaussian function that has the same second-order central moments as the source"
+    ),
+    "semiminor_sigma": (
+        "1-sigma standard deviation along the semiminor axis of the 2D Gaussian function that has the same second-order central moments as the source"
+    ),
+    "ellipticity": (
+        "1 minus the ratio of the 1-sigma lengths of the semimajor and semiminor axes"
+    ),
+    "orientation": (
+        "The angle (degrees) between the positive X axis and the major axis (increases counter-clockwise)"
+    ),
+    # orientation must be listed before sky_orientation
+    "sky_orientation": "The position angle (degrees) from North of the major axis",
+    "sky_bbox_ll": (
+        "Sky coordinate (ICRS) of the lower-left vertex of the minimal bounding box of the source"
+    ),
+    "sky_bbox_ul": (
+        "Sky coordinate (ICRS) of the upper-left vertex of the minimal bounding box of the source"
+    ),
+    "sky_bbox_lr": (
+        "Sky coordinate (ICRS) of the lower-right vertex of the minimal bounding box of the source"
+    ),
+    "sky_bbox_ur": (
+        "Sky coordinate (ICRS) of the upper-right vertex of the minimal bounding box of the source"
+    ),
+}
+
+_APER_BKG_DESCRIPTIONS = {
+    "aper_bkg_flux": (
+        "The local background value calculated as the sigma-clipped median value in the background annulus aperture"
+    ),
+    "aper_bkg_flux_err": (
+        "The standard error of the sigma-clipped median background value"
+    ),
+}
+
+_EXTRAS_DESCRIPTIONS = {
+    "flags": "Data quality flags",
+    "is_extended": "Flag indicating whether the source is extended",
+    "sharpness": "The DAOFind source sharpness statistic",
+    "roundness": "The DAOFind source roundness statistic",
+    "nn_label": "The label number of the nearest neighbor",
+    "nn_dist": "The distance in pixels to the nearest neighbor",
+}
+
+# the mapping between the PSF photometry table column names and the
+# final catalog column names and descriptions
+_PSF_PHOTOMETRY_MAPPING = (
+    {
+        "old_name": "flags",
+        "new_name": "flag_psf",
+        "desc": "Data quality flags",
+    },
+    {
+        "old_name": "x_fit",
+        "new_name": "x_psf",
+        "desc": "X coordinate as determined by PSF fitting",
+    },
+    {
+        "old_name": "x_err",
+        "new_name": "x_psf_err",
+        "desc": "Error on X coordinate of PSF fitting",
+    },
+    {
+        "old_name": "y_fit",
+        "new_name": "y_psf",
+        "desc": "Y coordinate as determined by PSF fitting",
+    },
+    {
+        "old_name": "y_err",
+        "new_name": "y_psf_err",
+        "desc": "Error on Y coordinate of PSF fitting",
+    },
+    {
+        "old_name": "flux_fit",
+        "new_name": "flux_psf",
+        "desc": "Source flux as determined by PSF photometry",
+    },
+    {
+        "old_name": "flux_err",
+        "new_name": "flux_psf_err",
+        "desc": "Source flux error as determined by PSF photometry",
+    },
+)
+_PSF_OLD_TO_NEW_NAMES = {x["old_name"]: x["new_name"] for x in _PSF_PHOTOMETRY_MAPPING}
+_PSF_NEW_NAME_DESCRIPTIONS = {x["new_name"]: x["desc"] for x in _PSF_PHOTOMETRY_MAPPING}
+
+
+@lru_cache(maxsize=32)
+def _aperture_colnames(aperture_ee, name):
+    """
+    Make the aperture column names.
+
+    The column names depend only on the aperture encircled energies, so
+    they are cached.
+
+    Parameters
+    ----------
+    aperture_ee : tuple of int
+        The aperture encircled energies.
+
+    name : {'flux', 'abmag'}
+        The name type of the column.
+
+    Returns
+    -------
+    colnames : tuple of str
+        The output column names.
+    """
+    colnames = []
+    for aper_ee in aperture_ee:
+        basename = f"aper{aper_ee}_{name}"
+        colnames.append(basename)
+        colnames.append(f"{basename}_err")
+    colnames.extend([f"aper_total_{name}", f"aper_total_{name}_err"])
+
+    return tuple(colnames)
+
+
+@lru_cache(maxsize=32)
+def _aperture_descriptions(aperture_ee, name):
+    """
+    Make the aperture column descriptions.
+
+    The column descriptions depend only on the aperture encircled
+    energies, so they are cached.
+
+    Parameters
+    ----------
+    aperture_ee : tuple of int
+        The aperture encircled energies.
+
+    name : {'flux', 'abmag'}
+        The name type of the column.
+
+    Returns
+    -------
+    descriptions : tuple of str
+        The output column descriptions.
+    """
+    if name == "flux":
+        ftype = "Flux"
+        ftype2 = "flux"
+    elif name == "abmag":
+        ftype = ftype2 = "AB magnitude"
+
+    desc = []
+    for aper_ee in aperture_ee:
+        desc.append(f"{ftype} within the {aper_ee}% encircled energy circular aperture")
+        desc.append(
+            f"{ftype} error within the {aper_ee}% encircled energy circular aperture"
+        )
+
+    desc.append(
+        f"Total aperture-corrected {ftype2} based on the {aperture_ee[-1]}% encircled energy circular aperture; should be used only for unresolved sources."
+    )
+    desc.append(
+        f"Total aperture-corrected {ftype2} error based on the {aperture_ee[-1]}% encircled energy circular aperture; should be used only for unresolved sources."
+    )
+
+    return tuple(desc)
+
+
+def _make_cutouts(data, xpos, ypos, shape):
+    """
+    Extract 2D cutouts centered on the input positions.
+
+    The cutouts are extracted for all positions at once with a single
+    fancy-indexing operation. Cutout pixels outside of the input data
+    are set to zero (as in `~astropy.nddata.utils.extract_array` with
+    ``fill_value=0.0``).
+
+    Parameters
+    ----------
+    data : 2D `~numpy.ndarray`
+        The input data array.
+
+    xpos, ypos : 1D `~numpy.ndarray`
+        The x and y pixel positions of the cutout centers.
+
+    shape : tuple of 2 int
+        The (ny, nx) shape of the cutouts.
+
+    Returns
+    -------
+    cutouts : 3D `~numpy.ndarray`
+        The cutouts with shape (ny, nx, npositions).
+    """
+    ny, nx = shape
+    # cutout starting indices, defined as in extract_array
+    ystart = np.ceil(ypos - (ny / 2.0)).astype(int)
+    xstart = np.ceil(xpos - (nx / 2.0)).astype(int)
+    yidx = ystart + np.arange(ny)[:, np.newaxis, np.newaxis]
+    xidx = xstart + np.arange(nx)[np.newaxis, :, np.newaxis]
+
+    outside = (
+        (yidx < 0) | (yidx >= data.shape[0]) | (xidx < 0) | (xidx >= data.shape[1])
+    )
+    cutouts = data[
+        np.clip(yidx, 0, data.shape[0] - 1), np.clip(xidx, 0, data.shape[1] - 1)
+    ]
+    cutouts[outside] = 0.0
+
+    return cutouts
+
+
+@lru_cache(maxsize=32)
+def _build_daofind_kernel(size, sigma):
+    """
+    Build the DAOFind kernel, a 2D circular Gaussian normalized to have
+    zero sum, and its circular mask.
+
+    The kernel depends only on its size and the Gaussian sigma, so it
+    is cached. The returned arrays are read-only.
+
+    Parameters
+    ----------
+    size : int
+        The (odd) kernel size in both x and y dimensions.
+
+    sigma : float
+        The Gaussian sigma in pixels.
+
+    Returns
+    -------
+    kernel : 2D `~numpy.ndarray`
+        The DAOFind kernel.
+
+    mask : 2D `~numpy.ndarray`
+        The DAOFind kernel circular mask (1=good pixels, 0=masked
+        pixels).
+    """
+    center = (size - 1) // 2
+    yy, xx = np.mgrid[0:size, 0:size]
+    r2 = (xx - center) ** 2 + (yy - center) ** 2
+    mask = np.sqrt(r2) <= max(2.0, 1.5 * sigma)
+
+    # Gaussian normalized to a peak value of 1
+    kernel = np.exp(-r2 / (2.0 * sigma**2))
+    kernel *= mask
+
+    # normalize the kernel to zero sum
+    npixels = mask.sum()
+    ksum = kernel.sum()
+    denom = np.sum(kernel**2) - (ksum**2 / npixels)
+    kernel = ((kernel - (ksum / npixels)) / denom) * mask
+    mask = mask.astype(int)
+    kernel.flags.writeable = False
+    mask.flags.writeable = False
+
+    return kernel, mask
+
+
+@lru_cache(maxsize=32)
+def _gridded_psf_model(filt, detector):
+    """
+    Create the gridded PSF model for a filter and detector.
+
+    Creating the model is expensive (the PSFs are computed with
+    WebbPSF), but it depends only on the filter and detector, so it is
+    cached. The PSF photometry fits copies of the model, so the cached
+    model is not modified.
+
+    Parameters
+    ----------
+    filt : str
+        The filter name (e.g., "F184").
+
+    detector : str
+        The detector name (e.g., "SCA02").
+
+    Returns
+    -------
+    gridded_psf_model : `photutils.psf.GriddedPSFModel`
+        The gridded PSF model.
+    """
+    # prefix of the temporary FITS file that will contain the gridded PSF model
+    path_prefix = "tmp"
+    gridded_psf_model, _ = psf.create_gridded_psf_model(
+        path_prefix=path_prefix,
+        filt=filt,
+        detector=detector,
+        overwrite=True,
+        logging_level="ERROR",
+    )
+
+    # remove temporary file containing gridded_psf_model
+    filepath = Path().cwd().glob(f"{path_prefix}*{detector.lower()}*.fits")
+    for filename in filepath:
+        filename.unlink(missing_ok=True)
+
+    return gridded_psf_model
+
+
 class RomanSourceCatalog:
     """
     Class for the Roman source catalog.
@@ -94,6 +402,7 @@ class RomanSourceCatalog:
         if not isinstance(model, (ImageModel, MosaicModel)):
             raise ValueError("The input model must be an ImageModel or MosaicModel.")
         self.model = model  # background was previously subtracted
+        self._is_l2 = isinstance(model, ImageModel)
 
         self.segment_img = segment_img
         self.convolved_data = convolved_data
@@ -118,12 +427,6 @@ class RomanSourceCatalog:
         self.wcs = self.model.meta.wcs
         self.column_desc = {}
         self.meta = {}
-        if self.fit_psf:
-            # get the necessary columns for the PSF photometry table
-            # and its name mapping to the final catalog
-            self.psf_photometry_catalog_mapping = (
-                self.get_psf_photometry_catalog_colnames_mapping()
-            )
 
     @lazyproperty
     def _pixscale_angle(self):
@@ -175,11 +478,7 @@ class RomanSourceCatalog:
                 f"data and err are expected to be in units of {self.l2_unit}"
             )
 
-        # the conversion in done in-place to avoid making copies of the data;
-        # use a dictionary to set the value to avoid on-the-fly validation
-        self.model["data"] *= self.l2_conv_factor
-        self.model["err"] *= self.l2_conv_factor
-        self.convolved_data *= self.l2_conv_factor
+        self._scale_data(self._l2_to_sb_factor, self.sb_unit)
 
     def convert_sb_to_l2(self):
         """
@@ -193,11 +492,46 @@ class RomanSourceCatalog:
                 f"data and err are expected to be in units of {self.sb_unit}"
             )
 
+        self._scale_data(1.0 / self._l2_to_sb_factor, self.l2_unit)
+
+    @lazyproperty
+    def _l2_to_sb_factor(self):
+        """
+        The multiplicative factor to convert level-2 values (in
+        ``l2_unit``) to surface brightness values (in ``sb_unit``).
+        """
+        return self.l2_conv_factor.to_value(u.Unit(self.sb_unit) / self.l2_unit)
+
+    @lazyproperty
+    def _sb_to_flux_factor(self):
+        """
+        The multiplicative factor to convert surface brightness values
+        (in ``sb_unit``) to flux density values (in ``flux_unit``).
+        """
+        return (self.sb_unit * self.pixel_area).to_value(self.flux_unit)
+
+    def _scale_data(self, factor, unit):
+        """
+        Scale the data, error, and convolved data arrays in place and
+        set their unit.
+
+        Each array is scaled with a single pass over its values; the new
+        unit is attached without copying the data. The arrays are not
+        traversed at all if the factor is 1 (e.g., if the units differ
+        only in name).
+        """
         # the conversion in done in-place to avoid making copies of the data;
         # use a dictionary to set the value to avoid on-the-fly validation
-        self.model["data"] /= self.l2_conv_factor
-        self.model["err"] /= self.l2_conv_factor
-        self.convolved_data /= self.l2_conv_factor
+        for name in ("data", "err"):
+            value = self.model[name].value
+            if factor != 1.0:
+                value *= factor
+            self.model[name] = u.Quantity(value, unit, copy=False)
+
+        value = self.convolved_data.value
+        if factor != 1.0:
+            value *= factor
+        self.convolved_data = u.Quantity(value, unit, copy=False)
 
     def convert_sb_to_flux_density(self):
         """
@@ -211,14 +545,7 @@ class RomanSourceCatalog:
                 f"data and err are expected to be in units of {self.sb_unit}"
             )
 
-        # the conversion in done in-place to avoid making copies of the data;
-        # use a dictionary to set the value to avoid on-the-fly validation
-        self.model["data"] *= self.pixel_area
-        self.model["data"] <<= self.flux_unit
-        self.model["err"] *= self.pixel_area
-        self.model["err"] <<= self.flux_unit
-        self.convolved_data *= self.pixel_area
-        self.convolved_data <<= self.flux_unit
+        self._scale_data(self._sb_to_flux_factor, self.flux_unit)
 
     def convert_flux_density_to_sb(self):
         """
@@ -235,12 +562,7 @@ class RomanSourceCatalog:
                 f"data and err are expected to be in units of {self.flux_unit}"
             )
 
-        self.model["data"] /= self.pixel_area
-        self.model["data"] <<= self.sb_unit
-        self.model["err"] /= self.pixel_area
-        self.model["err"] <<= self.sb_unit
-        self.convolved_data /= self.pixel_area
-        self.convolved_data <<= self.sb_unit
+        self._scale_data(1.0 / self._sb_to_flux_factor, self.sb_unit)
 
     def convert_flux_to_abmag(self, flux, flux_err):
         """
@@ -281,50 +603,9 @@ class RomanSourceCatalog:
         A dictionary of the output table column names and descriptions
         for the segment catalog.
         """
-        desc = {}
-        desc["label"] = "Unique source identification label number"
-        desc["xcentroid"] = "X pixel value of the source centroid (0 indexed)"
-        desc["ycentroid"] = "Y pixel value of the source centroid (0 indexed)"
-        desc["sky_centroid"] = " Sky coordinate (ICRS) of the source centroid"
-        desc["isophotal_flux"] = "Isophotal flux"
-        desc["isophotal_flux_err"] = "Isophotal flux error"
-        # isophotal_flux and isophotal_flux_err must be listed before isophotal_abmag
-        # TEMP: do not include ABmags
-        # desc["isophotal_abmag"] = "Isophotal AB magnitude"
-        # desc["isophotal_abmag_err"] = "Isophotal AB magnitude error"
-        desc["isophotal_area"] = "Isophotal area"
-        desc["semimajor_sigma"] = (
-            "1-sigma standard deviation along the semimajor axis of the 2D Gaussian function that has the same second-order central moments as the source"
-        )
-        desc["semiminor_sigma"] = (
-            "1-sigma standard deviation along the semiminor axis of the 2D Gaussian function that has the same second-order central moments as the source"
-        )
-        desc["ellipticity"] = (
-            "1 minus the ratio of the 1-sigma lengths of the semimajor and semiminor axes"
-        )
-        desc["orientation"] = (
-            "The angle (degrees) between the positive X axis and the major axis (increases counter-clockwise)"
-        )
-        # orientation must be listed before sky_orientation
-        desc["sky_orientation"] = (
-            "The position angle (degrees) from North of the major axis"
-        )
-        desc["sky_bbox_ll"] = (
-            "Sky coordinate (ICRS) of the lower-left vertex of the minimal bounding box of the source"
-        )
-        desc["sky_bbox_ul"] = (
-            "Sky coordinate (ICRS) of the upper-left vertex of the minimal bounding box of the source"
-        )
-        desc["sky_bbox_lr"] = (
-            "Sky coordinate (ICRS) of the lower-right vertex of the minimal bounding box of the source"
-        )
-        desc["sky_bbox_ur"] = (
-            "Sky coordinate (ICRS) of the upper-right vertex of the minimal bounding box of the source"
-        )
-
-        self.column_desc.update(desc)
+        self.column_desc.update(_SEGMENT_DESCRIPTIONS)
 
-        return list(desc.keys())
+        return list(_SEGMENT_DESCRIPTIONS.keys())
 
     def set_segment_properties(self):
         """
@@ -365,7 +646,7 @@ class RomanSourceCatalog:
         The (x, y) source positions, defined from the segmentation
         image.
         """
-        return np.transpose((self.xcentroid, self.ycentroid))
+        return np.column_stack((self.xcentroid, self.ycentroid))
 
     @lazyproperty
     def _xypos_aper(self):
@@ -378,17 +659,38 @@ class RomanSourceCatalog:
         NaN fluxes and errors.
         """
         xypos = self._xypos.copy()
-        nanmask = ~np.isfinite(xypos)
-        xypos[nanmask] = -1000.0
+        xypos[self._xypos_nonfinite_mask] = -1000.0
         return xypos
 
+    @lazyproperty
+    def _xcen_finite(self):
+        """
+        The contiguous x positions of the sources with finite positions.
+        """
+        return self.xcentroid[self._xypos_finite_mask]
+
+    @lazyproperty
+    def _ycen_finite(self):
+        """
+        The contiguous y positions of the sources with finite positions.
+        """
+        return self.ycentroid[self._xypos_finite_mask]
+
+    @lazyproperty
+    def _xypos_finite_mask(self):
+        """
+        A 1D boolean mask where `True` values denote sources where
+        both the xcentroid and the ycentroid are finite.
+        """
+        return np.isfinite(self.xcentroid) & np.isfinite(self.ycentroid)
+
     @lazyproperty
     def _xypos_nonfinite_mask(self):
         """
         A 1D boolean mask where `True` values denote sources where
         either the xcentroid or the ycentroid is not finite.
         """
-        return ~np.isfinite(self._xypos).all(axis=1)
+        return ~self._xypos_finite_mask
 
     @lazyproperty
     def _isophotal_abmag(self):
@@ -436,14 +738,7 @@ class RomanSourceCatalog:
         colnames : list of str
             A list of the output column names.
         """
-        colnames = []
-        for aper_ee in self.aperture_ee:
-            basename = f"aper{aper_ee}_{name}"
-            colnames.append(basename)
-            colnames.append(f"{basename}_err")
-        colnames.extend([f"aper_total_{name}", f"aper_total_{name}_err"])
-
-        return colnames
+        return list(_aperture_colnames(self._aperture_ee_key, name))
 
     def _make_aperture_descriptions(self, name):
         """
@@ -459,29 +754,16 @@ class RomanSourceCatalog:
         descriptions : list of str
             A list of the output column descriptions.
         """
-        if name == "flux":
-            ftype = "Flux"
-            ftype2 = "flux"
-        elif name == "abmag":
-            ftype = ftype2 = "AB magnitude"
-
-        desc = []
-        for aper_ee in self.aperture_ee:
-            desc.append(
-                f"{ftype} within the {aper_ee}% encircled energy circular aperture"
-            )
-            desc.append(
-                f"{ftype} error within the {aper_ee}% encircled energy circular aperture"
-            )
-
-        desc.append(
-            f"Total aperture-corrected {ftype2} based on the {self.aperture_ee[-1]}% encircled energy circular aperture; should be used only for unresolved sources."
-        )
-        desc.append(
-            f"Total aperture-corrected {ftype2} error based on the {self.aperture_ee[-1]}% encircled energy circular aperture; should be used only for unresolved sources."
-        )
+        return list(_aperture_descriptions(self._aperture_ee_key, name))
 
-        return desc
+    @lazyproperty
+    def _aperture_ee_key(self):
+        """
+        The aperture encircled energies as a hashable tuple of int,
+        used as the key for the cached aperture column names and
+        descriptions.
+        """
+        return tuple(int(aper_ee) for aper_ee in self.aperture_ee)
 
     @lazyproperty
     def aperture_flux_colnames(self):
@@ -517,13 +799,7 @@ class RomanSourceCatalog:
         A dictionary of the output table column names and descriptions
         for the aperture catalog.
         """
-        desc = {}
-        desc["aper_bkg_flux"] = (
-            "The local background value calculated as the sigma-clipped median value in the background annulus aperture"
-        )
-        desc["aper_bkg_flux_err"] = (
-            "The standard error of the sigma-clipped median background value"
-        )
+        desc = dict(_APER_BKG_DESCRIPTIONS)
 
         for idx, colname in enumerate(self.aperture_flux_colnames):
             desc[colname] = self.aperture_flux_descriptions[idx]
@@ -551,29 +827,65 @@ class RomanSourceCatalog:
             self.aperture_params["bkg_aperture_outer_radius"],
         )
         bkg_aper_masks = bkg_aper.to_mask(method="center")
-        sigclip = SigmaClip(sigma=3.0)
 
+        # the annulus pixel values of all sources, padded with NaN into a
+        # single 2D array (one row per source)
+        data = self.model.data.value
+        bkg_values = [mask.get_values(data) for mask in bkg_aper_masks]
+        maxlen = max(max(map(len, bkg_values), default=0), 1)
+        bkg_data = np.full((self.n_sources, maxlen), np.nan)
+        for row, values in zip(bkg_data, bkg_values):
+            row[: len(values)] = values
+
+        bkg_median, bkg_median_err = self._sigma_clipped_bkg_stats(bkg_data)
+
+        bkg_median <<= self.model.data.unit
+        bkg_median_err <<= self.model.data.unit
+
+        return bkg_median, bkg_median_err
+
+    @staticmethod
+    def _sigma_clipped_bkg_stats(bkg_data):
+        """
+        Calculate the local background and error from the annulus
+        pixel values of all sources.
+
+        Parameters
+        ----------
+        bkg_data : 2D `~numpy.ndarray`
+            The annulus pixel values, with one row per source. The rows
+            are padded with NaN.
+
+        Returns
+        -------
+        bkg_median, bkg_median_err : 1D `~numpy.ndarray`
+            The sigma-clipped median and its standard error for each
+            source.
+        """
+        sigclip = SigmaClip(sigma=3.0)
         with warnings.catch_warnings():
             warnings.simplefilter("ignore", category=RuntimeWarning)
             warnings.simplefilter("ignore", category=AstropyUserWarning)
 
-            nvalues = []
-            bkg_median = []
-            bkg_std = []
-            for mask in bkg_aper_masks:
-                bkg_data = mask.get_values(self.model.data.value)
-                values = sigclip(bkg_data, masked=False)
-                nvalues.append(values.size)
-                bkg_median.append(np.median(values))
-                bkg_std.append(np.std(values))
-
-            nvalues = np.array(nvalues)
-            bkg_median = np.array(bkg_median)
-            # standard error of the median
-            bkg_median_err = np.sqrt(np.pi / (2.0 * nvalues)) * np.array(bkg_std)
+            # clipped (and non-finite) values are returned as NaN
+            values = sigclip(bkg_data, axis=1, masked=False, copy=False)
+            nvalues = np.count_nonzero(~np.isnan(values), axis=1)
+
+            # np.nanmedian is much slower than the sigma clipping for
+            # many short rows; instead, sort the rows (the NaNs are
+            # sorted to the end) and take the middle unclipped values
+            values.sort(axis=1)
+            rows = np.arange(values.shape[0])
+            maxidx = values.shape[1] - 1
+            bkg_median = 0.5 * (
+                values[rows, np.clip((nvalues - 1) // 2, 0, maxidx)]
+                + values[rows, np.clip(nvalues // 2, 0, maxidx)]
+            )
+            bkg_median[nvalues == 0] = np.nan
+            bkg_std = np.nanstd(values, axis=1)
 
-        bkg_median <<= self.model.data.unit
-        bkg_median_err <<= self.model.data.unit
+            # standard error of the median
+            bkg_median_err = np.sqrt(np.pi / (2.0 * nvalues)) * bkg_std
 
         return bkg_median, bkg_median_err
 
@@ -601,27 +913,35 @@ class RomanSourceCatalog:
             CircularAperture(self._xypos_aper, radius)
             for radius in self.aperture_params["aperture_radii"]
         ]
-        aper_phot = aperture_photometry(
-            self.model.data, apertures, error=self.model.err
-        )
+        # compute the sums directly as arrays instead of building (and
+        # then unpacking) an aperture photometry table
+        sums = [
+            aperture.do_photometry(self.model.data, error=self.model.err)
+            for aperture in apertures
+        ]
+
+        # the fluxes are (naper, nsources) arrays so that the background
+        # subtraction is computed for all apertures at once
+        unit = self.model.data.unit
+        flux = np.array([aper_sum.value for aper_sum, _ in sums])
+        flux_err = np.array([aper_sum_err.value for _, aper_sum_err in sums])
+        areas = np.array([aperture.area for aperture in apertures])
 
-        for i, aperture in enumerate(apertures):
-            flux_col = f"aperture_sum_{i}"
-            flux_err_col = f"aperture_sum_err_{i}"
+        # subtract the local background measured in the annulus
+        flux -= areas[:, np.newaxis] * self.aper_bkg_flux.to_value(unit)
 
-            # subtract the local background measured in the annulus
-            aper_phot[flux_col] -= self.aper_bkg_flux * aperture.area
+        # the background-subtracted fluxes (without units) are reused
+        # for the concentration indices
+        self._aper_flux_matrix = flux
 
-            flux = aper_phot[flux_col]
-            flux_err = aper_phot[flux_err_col]
-            abmag, abmag_err = self.convert_flux_to_abmag(flux, flux_err)
+        flux <<= unit
+        flux_err <<= unit
 
+        for i in range(len(apertures)):
             idx0 = 2 * i
             idx1 = (2 * i) + 1
-            setattr(self, self.aperture_flux_colnames[idx0], flux)
-            setattr(self, self.aperture_flux_colnames[idx1], flux_err)
-            setattr(self, self.aperture_abmag_colnames[idx0], abmag)
-            setattr(self, self.aperture_abmag_colnames[idx1], abmag_err)
+            setattr(self, self.aperture_flux_colnames[idx0], flux[i])
+            setattr(self, self.aperture_flux_colnames[idx1], flux_err[i])
 
     @lazyproperty
     def extras_colnames(self):
@@ -633,12 +953,7 @@ class RomanSourceCatalog:
         for idx, colname in enumerate(self.ci_colnames):
             desc[colname] = self.ci_colname_descriptions[idx]
 
-        desc["flags"] = "Data quality flags"
-        desc["is_extended"] = "Flag indicating whether the source is extended"
-        desc["sharpness"] = "The DAOFind source sharpness statistic"
-        desc["roundness"] = "The DAOFind source roundness statistic"
-        desc["nn_label"] = "The label number of the nearest neighbor"
-        desc["nn_dist"] = "The distance in pixels to the nearest neighbor"
+        desc.update(_EXTRAS_DESCRIPTIONS)
         self.column_desc.update(desc)
 
         return list(desc.keys())
@@ -648,19 +963,22 @@ class RomanSourceCatalog:
         """
         Data quality flags.
         """
-        xyidx = np.round(self._xypos).astype(int)
-
-        try:
-            # L2 images have a dq array
-            dqflags = self.model.dq[xyidx[:, 1], xyidx[:, 0]]
-            # if dqflags contains the DO_NOT_USE flag, set to DO_NOT_USE
-            # (dq=1), otherwise 0
-            flags = dqflags & pixel.DO_NOT_USE
-
-        except AttributeError:
+        # sources with non-finite positions cannot be looked up in the
+        # image and are flagged as DO_NOT_USE
+        goodpos = self._xypos_finite_mask
+        xidx = np.rint(self._xcen_finite).astype(np.intp)
+        yidx = np.rint(self._ycen_finite).astype(np.intp)
+
+        if self._is_l2:
+            # L2 images have a dq array; if the dq contains the
+            # DO_NOT_USE flag, set to DO_NOT_USE (dq=1), otherwise 0
+            dq = self.model.dq
+            flags = np.full(self.n_sources, pixel.DO_NOT_USE, dtype=dq.dtype)
+            flags[goodpos] = dq[yidx, xidx] & pixel.DO_NOT_USE
+        else:
             # L3 images
-            mask = self.model.weight == 0
-            flags = mask[xyidx[:, 1], xyidx[:, 0]].astype(int)
+            flags = np.full(self.n_sources, pixel.DO_NOT_USE, dtype=int)
+            flags[goodpos] = self.model.weight[yidx, xidx] == 0
 
         return flags
 
@@ -706,15 +1024,12 @@ class RomanSourceCatalog:
               e.g., CI_70_50 = aper70_flux / aper50_flux
             * the (largest / smallest) aperture flux ratio
               e.g., CI_70_30 = aper70_flux / aper30_flux
+
+        The aperture fluxes are set by `set_aperture_properties`.
         """
-        fluxes = [
-            (self.aperture_flux_colnames[2 * j], self.aperture_flux_colnames[2 * i])
-            for (i, j) in self._ci_ee_indices
-        ]
-        return [
-            getattr(self, flux1).value / getattr(self, flux2).value
-            for flux1, flux2 in fluxes
-        ]
+        idx1, idx2 = np.transpose(self._ci_ee_indices)
+        flux = self._aper_flux_matrix
+        return list(flux[idx2] / flux[idx1])
 
     def set_ci_properties(self):
         """
@@ -755,12 +1070,9 @@ class RomanSourceCatalog:
 
         NOTE: 1=good pixels, 0=masked pixels
         """
-        yy, xx = np.mgrid[0 : self._daofind_kernel_size, 0 : self._daofind_kernel_size]
-        radius = np.sqrt(
-            (xx - self._daofind_kernel_center) ** 2
-            + (yy - self._daofind_kernel_center) ** 2
-        )
-        return (radius <= max(2.0, 1.5 * self.kernel_sigma)).astype(int)
+        return _build_daofind_kernel(
+            self._daofind_kernel_size, float(self.kernel_sigma)
+        )[1]
 
     @lazyproperty
     def _daofind_kernel(self):
@@ -768,101 +1080,204 @@ class RomanSourceCatalog:
         The DAOFind kernel, a 2D circular Gaussian normalized to have
         zero sum.
         """
-        size = self._daofind_kernel_size
-        kernel = Gaussian2DKernel(self.kernel_sigma, x_size=size, y_size=size).array
-        kernel *= self._daofind_kernel_mask
-        kernel /= np.max(kernel)
+        return _build_daofind_kernel(
+            self._daofind_kernel_size, float(self.kernel_sigma)
+        )[0]
+
+    @lazyproperty
+    def _daofind_data(self):
+        """
+        The input data in single precision for the DAOFind statistics.
 
-        # normalize the kernel to zero sum
-        npixels = self._daofind_kernel_mask.sum()
-        denom = np.sum(kernel**2) - (np.sum(kernel) ** 2 / npixels)
-        return ((kernel - (kernel.sum() / npixels)) / denom) * self._daofind_kernel_mask
+        Single precision is sufficient for the sharpness and roundness
+        statistics and halves the memory traffic of the convolution and
+        the cutout reductions.
+        """
+        return self.model.data.value.astype(np.float32, copy=False)
 
     @lazyproperty
     def _daofind_convolved_data(self):
         """
-        The DAOFind convolved data.
-        """
-        return ndimage.convolve(
-            self.model.data.value, self._daofind_kernel, mode="constant", cval=0.0
+        The DAOFind convolved data (in single precision).
+
+        FFT-based convolution is used for large kernels, where it is
+        much faster than direct convolution.
+        """
+        data = self._daofind_data
+        kernel = self._daofind_kernel
+        if kernel.size < 49:
+            return ndimage.convolve(data, kernel, mode="constant", cval=0.0)
+
+        # non-finite values would spread over the entire FFT output;
+        # zero them and then set only the output pixels whose kernel
+        # footprint (nonzero kernel values) includes them to NaN, as
+        # ndimage.convolve does
+        badmask = ~np.isfinite(data)
+        convolved_data = signal.fftconvolve(
+            np.where(badmask, np.float32(0.0), data),
+            kernel.astype(np.float32),
+            mode="same",
         )
+        if np.any(badmask):
+            footprint = kernel[::-1, ::-1] != 0
+            badmask = ndimage.maximum_filter(
+                badmask, footprint=footprint, mode="constant", cval=0
+            )
+            convolved_data[badmask] = np.nan
+
+        return convolved_data.astype(data.dtype, copy=False)
 
     @lazyproperty
     def _daofind_cutout(self):
         """
-        3D array containing 2D cutouts centered on each source from the
-        input data.
+        3D array containing 2D cutouts centered on each source with a
+        finite position from the input data.
 
         The cutout size always matches the size of the DAOFind kernel,
         which has odd dimensions.
+
+        The cutouts are stored with shape (ky, kx, nsources), i.e., with
+        the source axis as the fast (contiguous) axis, so that the
+        per-source reductions operate on long contiguous vectors.
         """
-        cutout = []
-        for xcen, ycen in zip(*np.transpose(self._xypos_aper)):
-            try:
-                cutout_ = extract_array(
-                    self.model.data,
-                    self._daofind_kernel.shape,
-                    (ycen, xcen),
-                    fill_value=0.0,
-                )
-            except NoOverlapError:
-                cutout_ = np.zeros(self._daofind_kernel.shape)
-            cutout.append(cutout_)
-
-        return np.array(cutout)  # all cutouts are the same size
+        return _make_cutouts(
+            self._daofind_data,
+            self._xcen_finite,
+            self._ycen_finite,
+            self._daofind_kernel.shape,
+        )
 
     @lazyproperty
     def _daofind_cutout_conv(self):
         """
-        3D array containing 2D cutouts centered on each source from the
-        DAOFind convolved data.
+        3D array containing 2D cutouts centered on each source with a
+        finite position from the DAOFind convolved data.
 
         The cutout size always matches the size of the DAOFind kernel,
         which has odd dimensions.
+
+        The cutouts are stored with shape (ky, kx, nsources), i.e., with
+        the source axis as the fast (contiguous) axis, so that the
+        per-source reductions operate on long contiguous vectors.
         """
-        cutout = []
-        for xcen, ycen in zip(*np.transpose(self._xypos_aper)):
-            try:
-                cutout_ = extract_array(
-                    self._daofind_convolved_data,
-                    self._daofind_kernel.shape,
-                    (ycen, xcen),
-                    fill_value=0.0,
-                )
-            except NoOverlapError:
-                cutout_ = np.zeros(self._daofind_kernel.shape)
-            cutout.append(cutout_)
-
-        return np.array(cutout)  # all cutouts are the same size
+        return _make_cutouts(
+            self._daofind_convolved_data,
+            self._xcen_finite,
+            self._ycen_finite,
+            self._daofind_kernel.shape,
+        )
 
     @lazyproperty
-    def sharpness(self):
+    def _daofind_sharpness_weights(self):
         """
-        The DAOFind source sharpness statistic.
+        The weights used to compute the mean of the unmasked cutout
+        pixels, excluding the central (peak) pixel, for the DAOFind
+        sharpness statistic.
+        """
+        weights = self._daofind_kernel_mask.astype(float)
+        weights[self._daofind_kernel_center, self._daofind_kernel_center] = 0.0
+        weights /= weights.sum()
+        return weights
 
-        The sharpness statistic measures the ratio of the difference
-        between the height of the central pixel and the mean of the
-        surrounding non-bad pixels to the height of the best fitting
-        Gaussian function at that point.
+    @lazyproperty
+    def _daofind_roundness_signs(self):
+        """
+        The signs (+1 or -1) of the four DAOFind roundness quadrants.
 
-        Stars generally have a ``sharpness`` between 0.2 and 1.0.
+        The central (peak) pixel, which does not belong to any quadrant,
+        has a value of 0.
+        """
+        center = self._daofind_kernel_center
+        signs = np.zeros(self._daofind_kernel.shape)
+        signs[0 : center + 1, center + 1 :] = -1.0  # quadrant 1
+        signs[0:center, 0 : center + 1] = 1.0  # quadrant 2
+        signs[center:, 0:center] = -1.0  # quadrant 3
+        signs[center + 1 :, center:] = 1.0  # quadrant 4
+        return signs
+
+    def _calc_sharpness(self):
+        """
+        Calculate the DAOFind sharpness statistic using NumPy.
         """
-        npixels = self._daofind_kernel_mask.sum() - 1  # exclude the peak pixel
-        data_masked = self._daofind_cutout * self._daofind_kernel_mask
         data_peak = self._daofind_cutout[
-            :, self._daofind_kernel_center, self._daofind_kernel_center
+            self._daofind_kernel_center, self._daofind_kernel_center
         ]
         conv_peak = self._daofind_cutout_conv[
-            :, self._daofind_kernel_center, self._daofind_kernel_center
+            self._daofind_kernel_center, self._daofind_kernel_center
         ]
 
-        data_mean = (np.sum(data_masked, axis=(1, 2)) - data_peak) / npixels
+        # mean of the unmasked cutout pixels, excluding the peak pixel,
+        # computed in a single pass over the cutouts without allocating
+        # a masked copy (accumulated in double precision)
+        data_mean = np.einsum(
+            "jki,jk->i", self._daofind_cutout, self._daofind_sharpness_weights
+        )
 
-        with warnings.catch_warnings():
-            # ignore 0 / 0 for non-finite xypos
-            warnings.simplefilter("ignore", category=RuntimeWarning)
+        # ignore 0 / 0 (e.g., for cutouts outside of the data)
+        with np.errstate(divide="ignore", invalid="ignore"):
             return (data_peak - data_mean) / conv_peak
 
+    def _calc_roundness(self):
+        """
+        Calculate the DAOFind roundness statistic using NumPy.
+        """
+        cutout_conv = self._daofind_cutout_conv
+        nsources = cutout_conv.shape[-1]
+
+        # the quadrant-signed sum and the absolute sum are computed
+        # as weighted sums of the cutout pixels; the weights of the
+        # central (peak) pixel are zero, so no copy of the cutouts is
+        # needed to exclude it (accumulated in double precision)
+        signs = self._daofind_roundness_signs
+        sum2 = np.einsum("jki,jk->i", cutout_conv, signs, dtype=np.float64)
+
+        # process the sources in blocks so that the absolute values of
+        # each block stay in cache
+        weights = np.abs(signs)
+        sum4 = np.empty(nsources)
+        block_size = max(1, 262144 // self._daofind_kernel.size)
+        for start in range(0, nsources, block_size):
+            block = np.abs(cutout_conv[..., start : start + block_size])
+            sum4[start : start + block_size] = np.einsum(
+                "jki,jk->i", block, weights, dtype=np.float64
+            )
+
+        sum2[sum2 == 0] = 0.0
+        sum4[sum4 == 0] = np.nan
+
+        # ignore 0 / 0 (e.g., for cutouts outside of the data)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return 2.0 * sum2 / sum4
+
+    @lazyproperty
+    def _daofind_statistics(self):
+        """
+        The DAOFind sharpness and roundness statistics.
+
+        The statistics are calculated only for sources with finite
+        positions; NaN is returned for the other sources.
+        """
+        sharpness = np.full(self.n_sources, np.nan)
+        roundness = np.full(self.n_sources, np.nan)
+        sharpness[self._xypos_finite_mask] = self._calc_sharpness()
+        roundness[self._xypos_finite_mask] = self._calc_roundness()
+
+        return sharpness, roundness
+
+    @lazyproperty
+    def sharpness(self):
+        """
+        The DAOFind source sharpness statistic.
+
+        The sharpness statistic measures the ratio of the difference
+        between the height of the central pixel and the mean of the
+        surrounding non-bad pixels to the height of the best fitting
+        Gaussian function at that point.
+
+        Stars generally have a ``sharpness`` between 0.2 and 1.0.
+        """
+        return self._daofind_statistics[0]
+
     @lazyproperty
     def roundness(self):
         """
@@ -875,40 +1290,34 @@ class RomanSourceCatalog:
         "Round" objects have a ``roundness`` close to 0, generally
         between -1 and 1.
         """
-        # set the central (peak) pixel to zero
-        cutout = self._daofind_cutout_conv.copy()
-        cutout[:, self._daofind_kernel_center, self._daofind_kernel_center] = 0.0
+        return self._daofind_statistics[1]
 
-        # calculate the four roundness quadrants
-        quad1 = cutout[
-            :, 0 : self._daofind_kernel_center + 1, self._daofind_kernel_center + 1 :
-        ]
-        quad2 = cutout[
-            :, 0 : self._daofind_kernel_center, 0 : self._daofind_kernel_center + 1
-        ]
-        quad3 = cutout[
-            :, self._daofind_kernel_center :, 0 : self._daofind_kernel_center
-        ]
-        quad4 = cutout[
-            :, self._daofind_kernel_center + 1 :, self._daofind_kernel_center :
-        ]
+    @lazyproperty
+    def _kdtree_finite_idx(self):
+        """
+        The indices of the sources with finite positions.
+        """
+        return np.flatnonzero(self._xypos_finite_mask)
 
-        axis = (1, 2)
-        sum2 = (
-            -quad1.sum(axis=axis)
-            + quad2.sum(axis=axis)
-            - quad3.sum(axis=axis)
-            + quad4.sum(axis=axis)
-        )
-        sum2[sum2 == 0] = 0.0
+    @lazyproperty
+    def _kdtree(self):
+        """
+        The k-d tree of the finite source positions.
 
-        sum4 = np.abs(cutout).sum(axis=axis)
-        sum4[sum4 == 0] = np.nan
+        The tree indices refer to ``_kdtree_finite_idx``. `None` is
+        returned if there are fewer than two finite source positions.
+        """
+        # non-finite xypos causes memory errors on linux, but not MacOS;
+        # build the tree only from the finite positions
+        finite_idx = self._kdtree_finite_idx
+        if len(finite_idx) < 2:
+            return None
 
-        with warnings.catch_warnings():
-            # ignore 0 / 0 for non-finite xypos
-            warnings.simplefilter("ignore", category=RuntimeWarning)
-            return 2.0 * sum2 / sum4
+        # the unbalanced tree without compact nodes is faster to build
+        # for the roughly uniform source positions
+        return cKDTree(
+            self._xypos[finite_idx], balanced_tree=False, compact_nodes=False
+        )
 
     @lazyproperty
     def _kdtree_query(self):
@@ -918,10 +1327,19 @@ class RomanSourceCatalog:
         if self.n_sources == 1:
             return [np.nan], [np.nan]
 
-        # non-finite xypos causes memory errors on linux, but not MacOS
-        tree = KDTree(self._xypos_aper)
-        qdist, qidx = tree.query(self._xypos_aper, k=[2])
-        return np.transpose(qdist)[0], np.transpose(qidx)[0]
+        dist = np.full(self.n_sources, np.nan)
+        idx = np.full(self.n_sources, -1, dtype=int)
+        tree = self._kdtree
+        if tree is not None:
+            # the nearest neighbor is the second closest point (the
+            # closest is the source itself); map the query indices back
+            # to the full source index space
+            finite_idx = self._kdtree_finite_idx
+            qdist, qidx = tree.query(tree.data, k=2, workers=-1)
+            dist[finite_idx] = qdist[:, 1]
+            idx[finite_idx] = finite_idx[qidx[:, 1]]
+
+        return dist, idx
 
     @lazyproperty
     def nn_label(self):
@@ -929,16 +1347,16 @@ class RomanSourceCatalog:
         The label number of the nearest neighbor.
 
         A label value of -1 is returned if there is only one detected
-        source and for sources with a non-finite xcentroid or ycentroid.
+        source, for sources with a non-finite xcentroid or ycentroid,
+        and if there are fewer than two sources with finite positions.
         """
         if self.n_sources == 1:
-            return -1
+            return np.array([-1])
 
-        nn_label = self.label[self._kdtree_query[1]]
-        # assign a label of -1 for non-finite xypos
-        nn_label[self._xypos_nonfinite_mask] = -1
-
-        return nn_label
+        # the nearest-neighbor index is -1 for sources without a
+        # nearest neighbor; assign them a label of -1
+        idx = self._kdtree_query[1]
+        return np.where(idx >= 0, self.label[idx], -1)
 
     @lazyproperty
     def nn_dist(self):
@@ -954,6 +1372,19 @@ class RomanSourceCatalog:
         nn_dist[self._xypos_nonfinite_mask] = np.nan
         return nn_dist * u.pixel
 
+    @lazyproperty
+    def _aper_total_flux(self):
+        """
+        The aperture-corrected total flux and error, based on the flux
+        in largest aperture.
+        """
+        idx = self.n_aper - 1  # use apcorr for the largest EE (largest radius)
+        apcorr = self.aperture_params["aperture_corrections"][idx]
+        colnames = self.aperture_flux_colnames
+        flux = getattr(self, colnames[idx * 2])
+        flux_err = getattr(self, colnames[idx * 2 + 1])
+        return apcorr * flux, apcorr * flux_err
+
     @lazyproperty
     def aper_total_flux(self):
         """
@@ -963,11 +1394,7 @@ class RomanSourceCatalog:
         The aperture-corrected total flux should be used only for
         unresolved sources.
         """
-        idx = self.n_aper - 1  # use apcorr for the largest EE (largest radius)
-        flux = self.aperture_params["aperture_corrections"][idx] * getattr(
-            self, self.aperture_flux_colnames[idx * 2]
-        )
-        return flux
+        return self._aper_total_flux[0]
 
     @lazyproperty
     def aper_total_flux_err(self):
@@ -978,11 +1405,7 @@ class RomanSourceCatalog:
         The aperture-corrected total flux error should be used only for
         unresolved sources.
         """
-        idx = self.n_aper - 1  # use apcorr for the largest EE (largest radius)
-        flux_err = self.aperture_params["aperture_corrections"][idx] * getattr(
-            self, self.aperture_flux_colnames[idx * 2 + 1]
-        )
-        return flux_err
+        return self._aper_total_flux[1]
 
     @lazyproperty
     def _abmag_total(self):
@@ -1018,10 +1441,12 @@ class RomanSourceCatalog:
         """
         The column name order for the final source catalog.
         """
-        colnames = self.segment_colnames[:4]
-        colnames.extend(self.aperture_colnames)
-        colnames.extend(self.extras_colnames)
-        colnames.extend(self.segment_colnames[4:])
+        colnames = [
+            *self.segment_colnames[:4],
+            *self.aperture_colnames,
+            *self.extras_colnames,
+            *self.segment_colnames[4:],
+        ]
         if self.fit_psf:
             colnames.extend(self.psf_photometry_colnames)
         return colnames
@@ -1053,38 +1478,52 @@ class RomanSourceCatalog:
 
         self.meta["aperture_params"] = self.aperture_params
 
-    def _split_skycoord(self, table):
+    def _split_skycoord(self, columns, descriptions):
         """
         Split SkyCoord columns into separate RA and Dec columns.
 
         Parameters
         ----------
-        table : `~astropy.table.Table`
-            The input table.
+        columns : dict
+            A dictionary of the output column names and values.
+
+        descriptions : dict
+            A dictionary of the output column names and descriptions.
 
         Returns
         -------
-        table : `~astropy.table.Table`
-            The output table with separate RA and Dec columns.
-        """
-        for colname in table.colnames:
-            if isinstance(table[colname], SkyCoord):
-                idx = table.colnames.index(colname)
-                ra = table[colname].ra
-                dec = table[colname].dec
-                ra_colname = colname.replace("sky", "ra")
-                dec_colname = colname.replace("sky", "dec")
-                table.remove_column(colname)
-                table.add_columns(
-                    [ra, dec], names=[ra_colname, dec_colname], indexes=[idx, idx]
-                )
-                desc = self.column_desc[colname]
-                ra_desc = desc.replace("Sky coordinate", "Right ascension")
-                dec_desc = desc.replace("Sky coordinate", "Declination")
-                table[ra_colname].info.description = ra_desc
-                table[dec_colname].info.description = dec_desc
-
-        return table
+        columns, descriptions : dict
+            The output column dictionaries with separate RA and Dec
+            columns.
+        """
+        # identify the SkyCoord columns in a single scan; the column
+        # dicts are rebuilt only if there are columns to split
+        skycoord_names = {
+            colname
+            for colname, column in columns.items()
+            if isinstance(column, SkyCoord)
+        }
+        if not skycoord_names:
+            return columns, descriptions
+
+        split_columns = {}
+        split_descriptions = {}
+        for colname, column in columns.items():
+            desc = descriptions[colname]
+            if colname not in skycoord_names:
+                split_columns[colname] = column
+                split_descriptions[colname] = desc
+                continue
+
+            for prefix, label, values in (
+                ("ra", "Right ascension", column.ra),
+                ("dec", "Declination", column.dec),
+            ):
+                name = colname.replace("sky", prefix)
+                split_columns[name] = values
+                split_descriptions[name] = desc.replace("Sky coordinate", label)
+
+        return split_columns, split_descriptions
 
     @staticmethod
     def get_psf_photometry_catalog_colnames_mapping() -> List:
@@ -1098,43 +1537,7 @@ class RomanSourceCatalog:
             and descriptions for PSF photometry catalog.
         """
 
-        return [
-            {
-                "old_name": "flags",
-                "new_name": "flag_psf",
-                "desc": "Data quality flags",
-            },
-            {
-                "old_name": "x_fit",
-                "new_name": "x_psf",
-                "desc": "X coordinate as determined by PSF fitting",
-            },
-            {
-                "old_name": "x_err",
-                "new_name": "x_psf_err",
-                "desc": "Error on X coordinate of PSF fitting",
-            },
-            {
-                "old_name": "y_fit",
-                "new_name": "y_psf",
-                "desc": "Y coordinate as determined by PSF fitting",
-            },
-            {
-                "old_name": "y_err",
-                "new_name": "y_psf_err",
-                "desc": "Error on Y coordinate of PSF fitting",
-            },
-            {
-                "old_name": "flux_fit",
-                "new_name": "flux_psf",
-                "desc": "Source flux as determined by PSF photometry",
-            },
-            {
-                "old_name": "flux_err",
-                "new_name": "flux_psf_err",
-                "desc": "Source flux error as determined by PSF photometry",
-            },
-        ]
+        return [dict(mapping) for mapping in _PSF_PHOTOMETRY_MAPPING]
 
     @lazyproperty
     def psf_photometry_colnames(self) -> List:
@@ -1148,11 +1551,9 @@ class RomanSourceCatalog:
         -------
             List of column names for PSF photometry results.
         """
-        desc = {x["new_name"]: x["desc"] for x in self.psf_photometry_catalog_mapping}
-
-        self.column_desc.update(desc)
+        self.column_desc.update(_PSF_NEW_NAME_DESCRIPTIONS)
 
-        return list(desc.keys())
+        return list(_PSF_NEW_NAME_DESCRIPTIONS.keys())
 
     def do_psf_photometry(self) -> None:
         """
@@ -1171,15 +1572,7 @@ class RomanSourceCatalog:
             # MosaicModel (L3 datamodel)
             filt = self.model.meta.basic.optical_element
             detector = "SCA02"
-        # prefix of the temporary FITS file that will contain the gridded PSF model
-        path_prefix = "tmp"
-        gridded_psf_model, _ = psf.create_gridded_psf_model(
-            path_prefix=path_prefix,
-            filt=filt,
-            detector=detector,
-            overwrite=True,
-            logging_level="ERROR",
-        )
+        gridded_psf_model = _gridded_psf_model(filt, detector)
 
         log.info("Fitting a PSF model to sources for improved astrometric precision.")
         psf_photometry_table, photometry = psf.fit_psf_to_image_model(
@@ -1190,56 +1583,51 @@ class RomanSourceCatalog:
             exclude_out_of_bounds=True,
         )
 
-        # mapping between the columns of the PSF photometry table
-        # and the name that will be used in the final catalog
-        old_name_to_new_name_mapping = {
-            x["old_name"]: x["new_name"] for x in self.psf_photometry_catalog_mapping
-        }
-
         # append PSF results to the class instance with the proper column name
-        for old_name, new_name in old_name_to_new_name_mapping.items():
+        for old_name, new_name in _PSF_OLD_TO_NEW_NAMES.items():
             setattr(self, new_name, psf_photometry_table[old_name])
 
-        # remove temporary file containing gridded_psf_model
-        filepath = Path().cwd().glob(f"{path_prefix}*{detector.lower()}*.fits")
-        for filename in filepath:
-            filename.unlink(missing_ok=True)
-
     @lazyproperty
     def catalog(self):
         """
         The final source catalog.
         """
         # convert L2 data units back to MJy/sr
-        if isinstance(self.model, ImageModel):
+        if self._is_l2:
             self.convert_l2_to_sb()
 
         self.convert_sb_to_flux_density()
-        self.set_segment_properties()
-        self.set_aperture_properties()
-        self.set_ci_properties()
-        if self.fit_psf:
-            self.do_psf_photometry()
-
-        catalog = QTable()
-        for column in self.colnames:
-            catalog[column] = getattr(self, column)
-            catalog[column].info.description = self.column_desc[column]
-        self._update_metadata()
-        catalog.meta.update(self.meta)
-
-        # convert QTable to Table to change Quantity columns to regular
-        # columns with units
-        catalog = Table(catalog)
-
-        # split SkyCoord columns into separate RA and Dec columns
-        catalog = self._split_skycoord(catalog)
-
-        # restore units on input model back to MJy/sr
-        self.convert_flux_density_to_sb()
+        try:
+            self.set_segment_properties()
+            self.set_aperture_properties()
+            self.set_ci_properties()
+            if self.fit_psf:
+                self.do_psf_photometry()
+
+            # split SkyCoord columns into separate RA and Dec columns
+            colnames = self.colnames
+            column_desc = self.column_desc
+            columns, descriptions = self._split_skycoord(
+                {column: getattr(self, column) for column in colnames},
+                {column: column_desc[column] for column in colnames},
+            )
 
-        # restore L2 data units back to DN/s
-        if isinstance(self.model, ImageModel):
-            self.convert_sb_to_l2()
+            # build the table in a single step instead of inserting the
+            # columns one at a time; a Table (instead of a QTable) is used
+            # to store the Quantity values as regular columns with units
+            catalog = Table(columns, copy=False)
+            # the table columns are in the same order as the descriptions
+            for column, desc in zip(catalog.itercols(), descriptions.values()):
+                column.info.description = desc
+            self._update_metadata()
+            catalog.meta.update(self.meta)
+        finally:
+            # restore units on input model back to MJy/sr, also if the
+            # catalog fails
+            self.convert_flux_density_to_sb()
+
+            # restore L2 data units back to DN/s
+            if self._is_l2:
+                self.convert_sb_to_l2()
 
         return catalog
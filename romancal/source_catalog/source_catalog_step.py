@@ -58,17 +58,31 @@ class SourceCatalogStep(RomanStep):
                 cat_model = datamodels.MosaicSourceCatalogModel
             source_catalog_model = maker_utils.mk_datamodel(cat_model)
 
-            for key in source_catalog_model.meta.keys():
-                value = (
-                    model.meta.instrument[key]
-                    if key == "optical_element"
-                    else model.meta[key]
-                )
-                source_catalog_model.meta[key] = value
+            # copy the metadata in a single update, looking up the model
+            # meta nodes only once
+            meta = model.meta
+            cat_meta = source_catalog_model.meta
+            cat_meta.update(
+                {
+                    key: (
+                        meta.instrument[key] if key == "optical_element" else meta[key]
+                    )
+                    for key in cat_meta.keys()
+                }
+            )
             aperture_ee = (self.aperture_ee1, self.aperture_ee2, self.aperture_ee3)
             refdata = ReferenceData(model, aperture_ee)
             aperture_params = refdata.aperture_params
 
+            # the detection and photometry are done in single precision;
+            # double-precision input arrays are replaced by float32
+            # copies, and the original arrays are restored at the end
+            data, err = model.data, model.err
+            single_precision = data.dtype == np.float32 and err.dtype == np.float32
+            if not single_precision:
+                model.data = data.astype(np.float32)
+                model.err = err.astype(np.float32)
+
             mask = np.isnan(model.data)
             coverage_mask = np.isnan(model.err)
             bkg = RomanBackground(
@@ -77,42 +91,49 @@ class SourceCatalogStep(RomanStep):
                 mask=mask,
                 coverage_mask=coverage_mask,
             )
+            # the background is subtracted in place instead of making a
+            # background-subtracted copy of the data
             model.data -= bkg.background
+            try:
+                convolved_data = convolve_data(
+                    model.data, kernel_fwhm=self.kernel_fwhm, mask=coverage_mask
+                )
 
-            convolved_data = convolve_data(
-                model.data, kernel_fwhm=self.kernel_fwhm, mask=coverage_mask
-            )
-
-            segment_img = make_segmentation_image(
-                convolved_data,
-                snr_threshold=self.snr_threshold,
-                npixels=self.npixels,
-                bkg_rms=bkg.background_rms,
-                deblend=self.deblend,
-                mask=coverage_mask,
-            )
-
-            if segment_img is None:  # no sources found
-                source_catalog_model.source_catalog = Table()
-                return source_catalog_model
-
-            ci_star_thresholds = (self.ci1_star_threshold, self.ci2_star_threshold)
-            catobj = RomanSourceCatalog(
-                model,
-                segment_img,
-                convolved_data,
-                aperture_params,
-                ci_star_thresholds,
-                self.kernel_fwhm,
-                self.fit_psf,
-            )
+                segment_img = make_segmentation_image(
+                    convolved_data,
+                    snr_threshold=self.snr_threshold,
+                    npixels=self.npixels,
+                    bkg_rms=bkg.background_rms,
+                    deblend=self.deblend,
+                    mask=coverage_mask,
+                )
 
-            # put the resulting catalog in the model
-            source_catalog_model.source_catalog = catobj.catalog
+                if segment_img is None:  # no sources found
+                    source_catalog_model.source_catalog = Table()
+                    return source_catalog_model
+
+                ci_star_thresholds = (self.ci1_star_threshold, self.ci2_star_threshold)
+                catobj = RomanSourceCatalog(
+                    model,
+                    segment_img,
+                    convolved_data,
+                    aperture_params,
+                    ci_star_thresholds,
+                    self.kernel_fwhm,
+                    self.fit_psf,
+                )
 
-            # add back background to data so input model is unchanged
-            # (in case of interactive use)
-            model.data += bkg.background
+                # put the resulting catalog in the model
+                source_catalog_model.source_catalog = catobj.catalog
+            finally:
+                # add back background to data so input model is unchanged
+                # (in case of interactive use), also if no sources are
+                # found or the catalog fails
+                if single_precision:
+                    model.data += bkg.background
+                else:
+                    model.data = data
+                    model.err = err
 
             if self.save_results:
                 # NOTE: the source_catalog_model is automatically saved
@@ -122,7 +143,13 @@ class SourceCatalogStep(RomanStep):
                 segmentation_model = maker_utils.mk_datamodel(
                     datamodels.MosaicSegmentationMapModel
                 )
-                segmentation_model.data = segment_img.data.astype(np.uint32)
+                segm_data = segment_img.data
+                if segm_data.dtype == np.int32:
+                    # the labels are non-negative, so their int32 and
+                    # uint32 representations are identical; reinterpret
+                    # the array instead of casting it
+                    segm_data = segm_data.view(np.uint32)
+                segmentation_model.data = segm_data.astype(np.uint32, copy=False)
                 self.save_model(segmentation_model, suffix="segm")
 
         return source_catalog_model
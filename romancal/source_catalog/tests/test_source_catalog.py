@@ -1,17 +1,23 @@
 import os
+import warnings
 
 import astropy.units as u
 import numpy as np
 import pytest
 from astropy.modeling.models import Gaussian2D
+from astropy.nddata import NoOverlapError, extract_array
+from astropy.stats import SigmaClip
 from astropy.table import Table
+from astropy.utils.exceptions import AstropyUserWarning
 from numpy.testing import assert_allclose
 from photutils.segmentation import SegmentationImage
 from roman_datamodels.datamodels import ImageModel, MosaicModel
+from roman_datamodels.dqflags import pixel
 from roman_datamodels.maker_utils import mk_level2_image, mk_level3_mosaic
+from scipy import ndimage
 
 from romancal.source_catalog.reference_data import ReferenceData
-from romancal.source_catalog.source_catalog import RomanSourceCatalog
+from romancal.source_catalog.source_catalog import RomanSourceCatalog, _make_cutouts
 from romancal.source_catalog.source_catalog_step import SourceCatalogStep
 
 
@@ -274,10 +280,11 @@ def test_background(mosaic_model):
 
 
 @pytest.mark.webbpsf
-def test_l2_input_model_unchanged(image_model, tmp_path):
+@pytest.mark.parametrize("snr_threshold", (0.5, 1000))
+def test_l2_input_model_unchanged(image_model, tmp_path, snr_threshold):
     """
     Test that the input model data and error arrays are unchanged after
-    processing by SourceCatalogStep.
+    processing by SourceCatalogStep, also if no sources are found.
     """
     os.chdir(tmp_path)
     original_data = image_model.data.copy()
@@ -286,7 +293,7 @@ def test_l2_input_model_unchanged(image_model, tmp_path):
     step = SourceCatalogStep()
     step.call(
         image_model,
-        snr_threshold=0.5,
+        snr_threshold=snr_threshold,
         npixels=5,
         bkg_boxsize=50,
         kernel_fwhm=2.0,
@@ -298,10 +305,11 @@ def test_l2_input_model_unchanged(image_model, tmp_path):
 
 
 @pytest.mark.webbpsf
-def test_l3_input_model_unchanged(mosaic_model, tmp_path):
+@pytest.mark.parametrize("snr_threshold", (0.5, 1000))
+def test_l3_input_model_unchanged(mosaic_model, tmp_path, snr_threshold):
     """
     Test that the input model data and error arrays are unchanged after
-    processing by SourceCatalogStep.
+    processing by SourceCatalogStep, also if no sources are found.
     """
     os.chdir(tmp_path)
     original_data = mosaic_model.data.copy()
@@ -310,7 +318,7 @@ def test_l3_input_model_unchanged(mosaic_model, tmp_path):
     step = SourceCatalogStep()
     step.call(
         mosaic_model,
-        snr_threshold=0.5,
+        snr_threshold=snr_threshold,
         npixels=5,
         bkg_boxsize=50,
         kernel_fwhm=2.0,
@@ -432,3 +440,187 @@ def test_do_psf_photometry_column_names(tmp_path, image_model, fit_psf):
     assert (fit_psf and psf_colnames_present) or (
         not fit_psf and psf_colnames_not_present
     )
+
+
+def make_catalog(model, xcentroid, ycentroid):
+    """
+    Make a catalog object with the given source positions.
+
+    The segment-based properties are set directly instead of being
+    measured from a segmentation image.
+    """
+    nsources = len(xcentroid)
+    segm = np.zeros(model.data.shape, dtype=int)
+    for i in range(nsources):
+        segm[i, 0] = i + 1
+    refdata = ReferenceData(model, (30, 50, 70))
+    cat = RomanSourceCatalog(
+        model,
+        SegmentationImage(segm),
+        model.data,
+        refdata.aperture_params,
+        (2.0, 1.8),
+        2.0,
+        fit_psf=False,
+    )
+    cat.label = np.arange(1, nsources + 1)
+    cat.xcentroid = np.array(xcentroid, dtype=float)
+    cat.ycentroid = np.array(ycentroid, dtype=float)
+
+    return cat
+
+
+@pytest.mark.parametrize(
+    "xcentroid, ycentroid, nn_label, nn_dist",
+    (
+        (
+            [10.0, 13.0, 30.0],
+            [10.0, 14.0, 10.0],
+            [2, 1, 2],
+            [5.0, 5.0, np.hypot(17.0, 4.0)],
+        ),
+        ([10.0, 13.0, np.nan], [10.0, 14.0, 20.0], [2, 1, -1], [5.0, 5.0, np.nan]),
+        ([10.0, np.nan], [10.0, 20.0], [-1, -1], [np.nan, np.nan]),
+        ([np.nan, np.nan], [10.0, 20.0], [-1, -1], [np.nan, np.nan]),
+        ([10.0], [10.0], [-1], [np.nan]),
+    ),
+)
+def test_nearest_neighbors(image_model, xcentroid, ycentroid, nn_label, nn_dist):
+    """
+    Test the nearest-neighbor labels and distances, including sources
+    with non-finite positions.
+    """
+    cat = make_catalog(image_model, xcentroid, ycentroid)
+
+    assert cat.nn_label.shape == (len(nn_label),)
+    np.testing.assert_equal(cat.nn_label, nn_label)
+    assert cat.nn_dist.unit == u.pixel
+    assert_allclose(cat.nn_dist.value, nn_dist)
+
+
+@pytest.mark.parametrize("kernel_sigma", (2.0, 3.5))
+def test_daofind_convolved_data_nan(image_model, kernel_sigma):
+    """
+    Test that the FFT-based DAOFind convolution of data with NaN values
+    matches direct convolution, including which output pixels are NaN.
+    """
+    image_model.data[50, 50] = np.nan
+    image_model.data[0, 10] = np.nan
+    image_model.data[90:93, 97:] = np.nan
+    cat = make_catalog(image_model, [10.0], [10.0])
+    cat.kernel_sigma = kernel_sigma
+    kernel = cat._daofind_kernel
+    assert kernel.size >= 49
+
+    result = cat._daofind_convolved_data
+
+    expected = ndimage.convolve(cat._daofind_data, kernel, mode="constant", cval=0.0)
+    assert result.dtype == np.float32
+    np.testing.assert_equal(np.isnan(result), np.isnan(expected))
+    assert_allclose(result, expected, rtol=0, atol=1e-4)
+
+
+@pytest.mark.parametrize("shape", ((7, 7), (5, 9)))
+def test_make_cutouts(shape):
+    """
+    Test the vectorized cutouts against extract_array, including for
+    sources at the edge of and completely outside of the data.
+    """
+    data = np.arange(40 * 50, dtype=float).reshape(40, 50) + 1.0
+    xpos = np.array([20.3, 0.0, 49.6, -1.4, 25.0, 53.0, -20.0, 10.5])
+    ypos = np.array([15.7, 0.0, 39.2, 20.0, 41.8, 45.0, -20.0, 38.5])
+
+    cutouts = _make_cutouts(data, xpos, ypos, shape)
+
+    assert cutouts.shape == (*shape, len(xpos))
+    for i, (xcen, ycen) in enumerate(zip(xpos, ypos)):
+        try:
+            expected = extract_array(
+                data, shape, (ycen, xcen), mode="partial", fill_value=0.0
+            )
+        except NoOverlapError:
+            expected = np.zeros(shape)
+        np.testing.assert_equal(cutouts[:, :, i], expected)
+
+
+@pytest.mark.parametrize("model_fixture", ("image_model", "mosaic_model"))
+def test_flags(request, model_fixture):
+    """
+    Test that sources at bad pixels or with non-finite positions are
+    flagged as DO_NOT_USE.
+    """
+    model = request.getfixturevalue(model_fixture)
+    if isinstance(model, ImageModel):
+        model.dq[:] = 0
+        model.dq[20, 30] = pixel.DO_NOT_USE
+    else:
+        model.weight[20, 30] = 0.0
+
+    xcentroid = [10.0, 30.2, np.nan, 10.0]
+    ycentroid = [10.0, 19.8, 20.0, np.inf]
+    cat = make_catalog(model, xcentroid, ycentroid)
+
+    np.testing.assert_equal(cat.flags, [0, 1, 1, 1])
+
+
+def test_sigma_clipped_bkg_stats():
+    """
+    Test the vectorized sigma-clipped local background statistics
+    against sigma clipping each source separately.
+    """
+    rng = np.random.default_rng(seed=0)
+    lengths = np.array([0, 1, 2, 7, 50, 113, 300, 5])
+    rows = [10.0 + rng.standard_t(2, size=length) for length in lengths]
+    rows[3][[1, 4]] = np.nan
+    rows[5][::10] = np.nan
+    rows[7][:] = np.nan
+    bkg_data = np.full((len(rows), lengths.max()), np.nan)
+    for i, row in enumerate(rows):
+        bkg_data[i, : len(row)] = row
+
+    bkg_median, bkg_median_err = RomanSourceCatalog._sigma_clipped_bkg_stats(bkg_data)
+
+    sigclip = SigmaClip(sigma=3.0, maxiters=5)
+    expected_median = []
+    expected_std = []
+    nvalues = []
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        warnings.simplefilter("ignore", category=AstropyUserWarning)
+        for row in rows:
+            clipped = sigclip(row, masked=False)
+            expected_median.append(np.nanmedian(clipped))
+            expected_std.append(np.nanstd(clipped))
+            nvalues.append(np.count_nonzero(~np.isnan(clipped)))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        expected_err = np.sqrt(np.pi / (2.0 * np.array(nvalues))) * expected_std
+
+    assert_allclose(bkg_median, expected_median, rtol=1e-12)
+    assert_allclose(bkg_median_err, expected_err, rtol=1e-12)
+
+
+@pytest.mark.parametrize("model_fixture", ("image_model", "mosaic_model"))
+def test_catalog_failure_restores_units(request, monkeypatch, model_fixture):
+    """
+    Test that the input model data and error arrays (and their units)
+    are restored if the catalog fails.
+    """
+    model = request.getfixturevalue(model_fixture)
+    original_data = model.data.copy()
+    original_err = model.err.copy()
+    cat = make_catalog(model, [10.0, 30.0], [10.0, 20.0])
+
+    def set_aperture_properties(self):
+        raise RuntimeError("catalog failed")
+
+    monkeypatch.setattr(
+        RomanSourceCatalog, "set_aperture_properties", set_aperture_properties
+    )
+    with pytest.raises(RuntimeError, match="catalog failed"):
+        _ = cat.catalog
+
+    assert model.data.unit == original_data.unit
+    assert model.err.unit == original_err.unit
+    assert_allclose(original_data, model.data, rtol=1e-12)
+    assert_allclose(original_err, model.err, rtol=1e-12)